@@ -1,13 +1,48 @@
-from fastapi import FastAPI, HTTPException
+from contextlib import asynccontextmanager
+from typing import Any, Dict, List, Union
+from fastapi import FastAPI, HTTPException, Request
+from fastapi.responses import ORJSONResponse
 from pydantic import BaseModel, Field
 from pathlib import Path
 from coordinators.coordinator import run_all_providers
+from utils.costs import BudgetExceededError
+from utils.results import ProviderResult, SegmentResult
+from utils.hedging import init_hedging, shutdown_hedging
+from connectors.openai_connector import detect_language_segments_openai
+from utils.config import HOST, PORT, WORKERS, PRELOAD_WHISPER
+from utils.shared_state import (
+    init_shared_state,
+    close_shared_state,
+    get_cached_result,
+    set_cached_result,
+    check_rate_limit,
+    purge_expired_results,
+)
 import time
 
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """Per-worker startup and shutdown hooks."""
+    init_shared_state()
+    purge_expired_results()
+    init_hedging()
+    if PRELOAD_WHISPER:
+        from connectors.openai_connector import get_whisper_model
+
+        get_whisper_model()
+    yield
+    # Let in-flight provider calls finish (and bill) before closing the database
+    shutdown_hedging()
+    close_shared_state()
+
+
 app = FastAPI(
     title="Language Detection Service",
     description="A service that detects spoken language in audio files using multiple AI providers",
     version="1.0.0",
+    lifespan=lifespan,
+    default_response_class=ORJSONResponse,
 )
 
 
@@ -22,7 +57,20 @@ class DetectRequest(BaseModel):
 class DetectResponse(BaseModel):
     ground_truth: str
     total_execution_time: float
-    results: list
+    # True when results (and their timings) come from an earlier run
+    cached: bool = False
+    # Provider results followed by the SUMMARY entry
+    results: List[Union[ProviderResult, Dict[str, Any]]]
+
+
+class SegmentRequest(BaseModel):
+    audio_file_path: str = Field(..., description="Path to the audio file to analyze")
+    window_seconds: int = Field(
+        30, ge=1, le=30, description="Length of each detection window in seconds"
+    )
+    batch_size: int = Field(
+        16, ge=1, le=128, description="Windows processed per Whisper forward pass"
+    )
 
 
 @app.get("/")
@@ -32,6 +80,7 @@ def read_root():
         "version": "1.0.0",
         "endpoints": {
             "detect": "/detect/language (POST)",
+            "detect_segments": "/detect/language/segments (POST)",
             "test_files": "/test-files (GET)",
             "docs": "/docs (GET)",
         },
@@ -63,49 +112,119 @@ def list_test_files():
     }
 
 
+def validate_audio_file(audio_file_path: str):
+    """Raise an HTTPException if the audio file is missing or unsupported."""
+    # Validate audio file exists
+    if not Path(audio_file_path).exists():
+        raise HTTPException(
+            status_code=404, detail=f"Audio file not found: {audio_file_path}"
+        )
+
+    # Validate file extension
+    valid_extensions = {".mp3", ".wav", ".m4a", ".flac", ".ogg", ".wma"}
+    file_extension = Path(audio_file_path).suffix.lower()
+    if file_extension not in valid_extensions:
+        raise HTTPException(
+            status_code=400,
+            detail=f"Unsupported audio format: {file_extension}. Supported formats: {', '.join(valid_extensions)}",
+        )
+
+
+def build_cache_key(audio_file_path: str) -> str:
+    """Cache key that changes whenever the audio file is modified."""
+    path = Path(audio_file_path).resolve()
+    stat = path.stat()
+    return f"detect:{path}:{stat.st_mtime_ns}:{stat.st_size}"
+
+
 @app.post("/detect/language", response_model=DetectResponse)
-def detect_language(req: DetectRequest):
+def detect_language(req: DetectRequest, request: Request):
     """
     Detect the spoken language in an audio file using multiple AI providers.
 
     - **audio_file_path**: Path to the audio file (supports common formats like .mp3, .wav, .m4a)
     - **ground_truth_language**: Expected language code for comparison purposes
 
+    The optional `X-Tenant-ID` header selects whose daily budget is charged.
+
     Returns results from all configured providers with timing and cost information.
     """
     start_time = time.time()
+    tenant_id = request.headers.get("X-Tenant-ID", "default")
 
-    # Validate audio file exists
-    if not Path(req.audio_file_path).exists():
-        raise HTTPException(
-            status_code=404, detail=f"Audio file not found: {req.audio_file_path}"
-        )
+    client_key = request.client.host if request.client else "anonymous"
+    if not check_rate_limit(client_key):
+        raise HTTPException(status_code=429, detail="Rate limit exceeded")
 
-    # Validate file extension
-    valid_extensions = {".mp3", ".wav", ".m4a", ".flac", ".ogg", ".wma"}
-    file_extension = Path(req.audio_file_path).suffix.lower()
-    if file_extension not in valid_extensions:
-        raise HTTPException(
-            status_code=400,
-            detail=f"Unsupported audio format: {file_extension}. Supported formats: {', '.join(valid_extensions)}",
-        )
+    validate_audio_file(req.audio_file_path)
 
     try:
-        # Run all providers
-        results = run_all_providers(req.audio_file_path)
+        # Results are shared across worker processes
+        cache_key = build_cache_key(req.audio_file_path)
+        results = get_cached_result(cache_key)
+        cached = results is not None
+        if cached:
+            # Nothing was billed or hedged for this request; provider timings
+            # are from the original run, which the cached flag makes explicit
+            summary = results[-1]["summary_metrics"]
+            summary["billed_cost"] = 0.0
+            summary["hedging"] = {}
+        else:
+            results = run_all_providers(req.audio_file_path, tenant_id)
+            # Only cache complete runs: a transient provider error or a
+            # budget-downgraded run must not be served to other requests
+            if all(r.status == "success" for r in results[:-1]):
+                set_cached_result(cache_key, results)
         total_time = time.time() - start_time
 
-        return {
-            "ground_truth": req.ground_truth_language,
-            "total_execution_time": round(total_time, 2),
-            "results": results,
-        }
+        # Returning the response directly skips pydantic validation of the
+        # nested results; orjson serializes the dataclasses natively
+        return ORJSONResponse(
+            {
+                "ground_truth": req.ground_truth_language,
+                "total_execution_time": round(total_time, 2),
+                "cached": cached,
+                "results": results,
+            }
+        )
 
+    except BudgetExceededError as e:
+        raise HTTPException(status_code=402, detail=str(e))
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Internal server error: {str(e)}")
 
 
+@app.post("/detect/language/segments", response_model=SegmentResult)
+def detect_language_segments(req: SegmentRequest, request: Request):
+    """
+    Detect language changes over time in long or code-switched audio.
+
+    - **audio_file_path**: Path to the audio file
+    - **window_seconds**: Length of each detection window (max 30)
+    - **batch_size**: Number of windows per Whisper forward pass
+
+    Returns a timeline of (start, end, language, confidence) segments and
+    the share of audio time per language.
+    """
+    client_key = request.client.host if request.client else "anonymous"
+    if not check_rate_limit(client_key):
+        raise HTTPException(status_code=429, detail="Rate limit exceeded")
+
+    validate_audio_file(req.audio_file_path)
+
+    result = detect_language_segments_openai(
+        req.audio_file_path, req.window_seconds, req.batch_size
+    )
+    if result.status != "success":
+        raise HTTPException(
+            status_code=500,
+            detail=f"Internal server error: {result.error_message}",
+        )
+    return ORJSONResponse(result)
+
+
 if __name__ == "__main__":
     import uvicorn
 
-    uvicorn.run(app, host="0.0.0.0", port=8000)
+    # Multiple workers require the app as an import string
+    uvicorn.run("api.main:app", host=HOST, port=PORT, workers=WORKERS)
@@ -1,6 +1,9 @@
 import time
 import os
 from pathlib import Path
+from utils.audio import get_audio_duration_seconds
+from utils.costs import calculate_cost
+from utils.results import ProviderResult
 
 
 def detect_language_elevenlabs(audio_file_path: str):
@@ -17,6 +20,8 @@ def detect_language_elevenlabs(audio_file_path: str):
         if not Path(audio_file_path).exists():
             raise FileNotFoundError(f"Audio file not found: {audio_file_path}")
 
+        audio_duration_minutes = get_audio_duration_seconds(audio_file_path) / 60
+
         # Simulate processing time
         time.sleep(0.5)
 
@@ -37,27 +42,25 @@ def detect_language_elevenlabs(audio_file_path: str):
 
         elapsed = time.time() - start_time
 
-        # Mock cost estimation
-        estimated_cost = 0.01
+        # Equivalent API price for comparison; the mock isn't billed
+        estimated_cost = calculate_cost(
+            "elevenlabs", {"audio_duration_minutes": audio_duration_minutes}
+        )
 
-        return {
-            "provider": "ElevenLabs",
-            "language": detected_lang,
-            "time_seconds": round(elapsed, 2),
-            "estimated_cost": estimated_cost,
-            "tokens_used": {"audio_analysis_units": 1},  # Mock unit
-            "status": "success",
-            "error_message": None,
-        }
+        return ProviderResult(
+            provider="ElevenLabs",
+            language=detected_lang,
+            time_seconds=round(elapsed, 2),
+            estimated_cost=round(estimated_cost, 6),
+            tokens_used={"audio_duration_minutes": round(audio_duration_minutes, 2)},
+            status="success",
+        )
 
     except Exception as e:
         elapsed = time.time() - start_time
-        return {
-            "provider": "ElevenLabs",
-            "language": None,
-            "time_seconds": round(elapsed, 2),
-            "estimated_cost": 0,
-            "tokens_used": {"audio_analysis_units": 0},
-            "status": "error",
-            "error_message": str(e),
-        }
+        return ProviderResult.error(
+            "ElevenLabs",
+            elapsed,
+            str(e),
+            tokens_used={"audio_duration_minutes": 0},
+        )
@@ -3,6 +3,8 @@ import google.generativeai as genai
 from pathlib import Path
 from dotenv import load_dotenv
 import os
+from utils.costs import calculate_cost
+from utils.results import ProviderResult
 
 load_dotenv()
 
@@ -23,49 +25,53 @@ def detect_language_gemini(audio_file_path: str):
         # Upload the audio file
         audio_file = genai.upload_file(audio_file_path)
 
-        prompt = """
-        Please analyze this audio file and detect the primary language being spoken.
-        Return only the ISO 639-1 language code (e.g., 'en' for English, 'hi' for Hindi, 'es' for Spanish, etc.).
-        If you cannot determine the language, return 'unknown'.
-        """
+        try:
+            prompt = """
+            Please analyze this audio file and detect the primary language being spoken.
+            Return only the ISO 639-1 language code (e.g., 'en' for English, 'hi' for Hindi, 'es' for Spanish, etc.).
+            If you cannot determine the language, return 'unknown'.
+            """
 
-        response = model.generate_content([prompt, audio_file])
-        detected_lang = response.text.strip().lower()
+            response = model.generate_content([prompt, audio_file])
+            detected_lang = response.text.strip().lower()
 
-        # Clean up the uploaded file
-        genai.delete_file(audio_file.name)
+            # Real token usage reported by the API. gemini-2.5-flash bills
+            # thinking tokens at the output rate, and candidates_token_count
+            # leaves them out, so output is everything beyond the prompt.
+            usage = response.usage_metadata
+            input_tokens = usage.prompt_token_count
+            output_tokens = usage.total_token_count - usage.prompt_token_count
+        finally:
+            # Clean up the uploaded file; a cleanup failure must not turn a
+            # billed detection into an error
+            try:
+                genai.delete_file(audio_file.name)
+            except Exception:
+                pass
 
         elapsed = time.time() - start_time
 
-        # Estimate cost (Gemini 2.0 Flash)
-        estimated_input_tokens = 1000  # Rough estimate for audio processing
-        estimated_output_tokens = 10
+        estimated_cost = calculate_cost(
+            "gemini", {"input": input_tokens, "output": output_tokens}
+        )
 
-        estimated_cost = (
-            estimated_input_tokens * 0.0375 + estimated_output_tokens * 0.15
-        ) / 1000000
-
-        return {
-            "provider": "Google Gemini",
-            "language": detected_lang,
-            "time_seconds": round(elapsed, 2),
-            "estimated_cost": round(estimated_cost, 6),
-            "tokens_used": {
-                "input": estimated_input_tokens,
-                "output": estimated_output_tokens,
+        return ProviderResult(
+            provider="Google Gemini",
+            language=detected_lang,
+            time_seconds=round(elapsed, 2),
+            estimated_cost=round(estimated_cost, 6),
+            tokens_used={
+                "input": input_tokens,
+                "output": output_tokens,
             },
-            "status": "success",
-            "error_message": None,
-        }
+            status="success",
+        )
 
     except Exception as e:
         elapsed = time.time() - start_time
-        return {
-            "provider": "Google Gemini",
-            "language": None,
-            "time_seconds": round(elapsed, 2),
-            "estimated_cost": 0,
-            "tokens_used": {"input": 0, "output": 0},
-            "status": "error",
-            "error_message": str(e),
-        }
+        return ProviderResult.error(
+            "Google Gemini",
+            elapsed,
+            str(e),
+            tokens_used={"input": 0, "output": 0},
+        )
@@ -1,10 +1,20 @@
 import time
+import subprocess
+import tempfile
+import numpy as np
+import torch
 import whisper
 import os
 from pathlib import Path
+from utils.costs import calculate_cost
+from utils.results import ProviderResult, SegmentResult
 
 model = None
 
+# Windows shorter than this are mostly padding once Whisper pads them to
+# 30 s, so they're folded into the previous segment instead of classified
+MIN_WINDOW_SECONDS = 1.0
+
 
 def get_whisper_model():
     """Load Whisper model lazily"""
@@ -27,6 +37,8 @@ def detect_language_openai(audio_file_path: str):
 
         # Load and process audio file
         audio = whisper.load_audio(audio_file_path)
+        # Measure the real duration before trimming to Whisper's 30 s window
+        audio_duration_seconds = len(audio) / whisper.audio.SAMPLE_RATE
         audio = whisper.pad_or_trim(audio)
 
         # Make log-Mel spectrogram and move to the same device as the model
@@ -41,36 +53,245 @@ def detect_language_openai(audio_file_path: str):
 
         elapsed = time.time() - start_time
 
-        # Estimate audio duration (rough calculation based on array length)
-        audio_duration_seconds = len(audio) / whisper.audio.SAMPLE_RATE
         audio_duration_minutes = audio_duration_seconds / 60
 
         # Local Whisper is free, but estimate equivalent API cost for comparison
-        estimated_cost = audio_duration_minutes * 0.006  # OpenAI API pricing
-
-        return {
-            "provider": "OpenAI Whisper (Local)",
-            "language": detected_lang,
-            "confidence": round(confidence, 3),
-            "time_seconds": round(elapsed, 2),
-            "estimated_cost": round(estimated_cost, 4),
-            "tokens_used": {
+        estimated_cost = calculate_cost(
+            "openai", {"audio_duration_minutes": audio_duration_minutes}
+        )
+
+        return ProviderResult(
+            provider="OpenAI Whisper (Local)",
+            language=detected_lang,
+            confidence=round(confidence, 3),
+            time_seconds=round(elapsed, 2),
+            estimated_cost=round(estimated_cost, 4),
+            tokens_used={
                 "audio_duration_minutes": round(audio_duration_minutes, 2),
                 "audio_duration_seconds": round(audio_duration_seconds, 1),
             },
-            "status": "success",
-            "error_message": None,
-        }
+            status="success",
+        )
+
+    except Exception as e:
+        elapsed = time.time() - start_time
+        return ProviderResult.error(
+            "OpenAI Whisper (Local)",
+            elapsed,
+            str(e),
+            tokens_used={"audio_duration_minutes": 0, "audio_duration_seconds": 0},
+        )
+
+
+def _stream_audio_windows(audio_file_path: str, window_seconds: int):
+    """
+    Decode audio with ffmpeg and yield fixed-size windows of float32 samples,
+    so only one window is held in memory at a time.
+    """
+    sample_rate = whisper.audio.SAMPLE_RATE
+    window_bytes = window_seconds * sample_rate * 2  # 16-bit mono PCM
+    cmd = [
+        "ffmpeg",
+        "-nostdin",
+        "-threads",
+        "0",
+        "-i",
+        audio_file_path,
+        "-f",
+        "s16le",
+        "-ac",
+        "1",
+        "-acodec",
+        "pcm_s16le",
+        "-ar",
+        str(sample_rate),
+        "-",
+    ]
+    # stderr goes to a temp file so a chatty ffmpeg can't block on a full pipe
+    with tempfile.TemporaryFile() as stderr:
+        process = subprocess.Popen(cmd, stdout=subprocess.PIPE, stderr=stderr)
+        try:
+            while True:
+                chunk = process.stdout.read(window_bytes)
+                if not chunk:
+                    break
+                # Drop a trailing odd byte if ffmpeg split mid-sample
+                chunk = chunk[: len(chunk) - len(chunk) % 2]
+                yield np.frombuffer(chunk, np.int16).astype(np.float32) / 32768.0
+
+            # A corrupt file or mid-stream decode error ends the output early;
+            # don't report the truncated timeline as a success
+            if process.wait() != 0:
+                stderr.seek(0)
+                message = stderr.read().decode(errors="replace").strip()
+                raise RuntimeError(
+                    f"ffmpeg failed to decode audio (exit code {process.returncode}): {message}"
+                )
+        finally:
+            process.stdout.close()
+            if process.poll() is None:
+                process.kill()
+                process.wait()
+
+
+def _detect_window_batch(whisper_model, windows: list):
+    """Run Whisper language detection on a batch of windows in one forward pass."""
+    mels = torch.stack(
+        [
+            whisper.log_mel_spectrogram(
+                whisper.pad_or_trim(window), n_mels=whisper_model.dims.n_mels
+            )
+            for window in windows
+        ]
+    ).to(whisper_model.device)
+    _, probs = whisper_model.detect_language(mels)
+    return probs
+
+
+def _add_window(segments: list, start: float, duration: float, probs: dict) -> float:
+    """
+    Append one window's detection to the timeline, merging it into the
+    previous segment when the language is unchanged. A window shorter than
+    MIN_WINDOW_SECONDS just extends the previous segment.
+
+    Returns:
+        float: End time of the window
+    """
+    end = start + duration
+    previous = segments[-1] if segments else None
+    if previous and duration < MIN_WINDOW_SECONDS:
+        previous["end"] = end
+        return end
+
+    lang = max(probs, key=probs.get)
+    if previous and previous["language"] == lang:
+        # Duration-weighted mean confidence of merged windows
+        prev_duration = previous["end"] - previous["start"]
+        previous["confidence"] = (
+            previous["confidence"] * prev_duration + probs[lang] * duration
+        ) / (prev_duration + duration)
+        previous["end"] = end
+    else:
+        segments.append(
+            {"start": start, "end": end, "language": lang, "confidence": probs[lang]}
+        )
+    return end
+
+
+def _summarize_segments(segments: list):
+    """
+    Compute per-language time share and the dominant language's
+    duration-weighted detection probability.
+
+    Returns:
+        tuple: (language_share sorted by share, dominant language, confidence)
+    """
+    language_seconds = {}
+    weighted_confidence = {}
+    for segment in segments:
+        duration = segment["end"] - segment["start"]
+        lang = segment["language"]
+        language_seconds[lang] = language_seconds.get(lang, 0.0) + duration
+        weighted_confidence[lang] = (
+            weighted_confidence.get(lang, 0.0) + segment["confidence"] * duration
+        )
+
+    total_seconds = sum(language_seconds.values())
+    language_share = {
+        lang: round(seconds / total_seconds, 3)
+        for lang, seconds in sorted(
+            language_seconds.items(), key=lambda item: item[1], reverse=True
+        )
+    }
+    dominant = next(iter(language_share))
+    confidence = weighted_confidence[dominant] / language_seconds[dominant]
+    return language_share, dominant, confidence
+
+
+def detect_language_segments_openai(
+    audio_file_path: str, window_seconds: int = 30, batch_size: int = 16
+):
+    """
+    Segmental language detection for long or code-switched audio.
+
+    The file is streamed in windows of window_seconds; windows are batched
+    through Whisper's detect_language and adjacent windows with the same
+    language are merged into a timeline.
+
+    Args:
+        audio_file_path (str): Path to the audio file
+        window_seconds (int): Window length, at most 30 (Whisper's context)
+        batch_size (int): Windows per forward pass; bounds memory use
+
+    Returns:
+        SegmentResult: Result with a segment timeline and per-language time share
+    """
+    start_time = time.time()
+    try:
+        if not Path(audio_file_path).exists():
+            raise FileNotFoundError(f"Audio file not found: {audio_file_path}")
+
+        window_seconds = max(1, min(window_seconds, whisper.audio.CHUNK_LENGTH))
+        whisper_model = get_whisper_model()
+        sample_rate = whisper.audio.SAMPLE_RATE
+
+        segments = []
+        offset = 0.0
+        batch = []
+
+        def flush(batch, offset):
+            for window, probs in zip(batch, _detect_window_batch(whisper_model, batch)):
+                offset = _add_window(segments, offset, len(window) / sample_rate, probs)
+            return offset
+
+        for window in _stream_audio_windows(audio_file_path, window_seconds):
+            batch.append(window)
+            if len(batch) >= batch_size:
+                offset = flush(batch, offset)
+                batch = []
+        if batch:
+            offset = flush(batch, offset)
+
+        if not segments:
+            raise ValueError("No audio decoded from file")
+
+        total_seconds = offset
+        language_share, detected_lang, confidence = _summarize_segments(segments)
+
+        elapsed = time.time() - start_time
+        audio_duration_minutes = total_seconds / 60
+        estimated_cost = calculate_cost(
+            "openai", {"audio_duration_minutes": audio_duration_minutes}
+        )
+
+        return SegmentResult(
+            provider="OpenAI Whisper (Local)",
+            language=detected_lang,
+            confidence=round(confidence, 3),
+            segments=[
+                {
+                    "start": round(segment["start"], 2),
+                    "end": round(segment["end"], 2),
+                    "language": segment["language"],
+                    "confidence": round(segment["confidence"], 3),
+                }
+                for segment in segments
+            ],
+            language_share=language_share,
+            time_seconds=round(elapsed, 2),
+            estimated_cost=round(estimated_cost, 4),
+            tokens_used={
+                "audio_duration_minutes": round(audio_duration_minutes, 2),
+                "audio_duration_seconds": round(total_seconds, 1),
+            },
+            status="success",
+        )
 
     except Exception as e:
         elapsed = time.time() - start_time
-        return {
-            "provider": "OpenAI Whisper (Local)",
-            "language": None,
-            "confidence": 0.0,
-            "time_seconds": round(elapsed, 2),
-            "estimated_cost": 0,
-            "tokens_used": {"audio_duration_minutes": 0, "audio_duration_seconds": 0},
-            "status": "error",
-            "error_message": str(e),
-        }
+        return SegmentResult.error(
+            "OpenAI Whisper (Local)",
+            elapsed,
+            str(e),
+            tokens_used={"audio_duration_minutes": 0, "audio_duration_seconds": 0},
+        )
@@ -2,6 +2,9 @@ import time
 import requests
 import os
 from pathlib import Path
+from utils.audio import get_audio_duration_seconds
+from utils.costs import calculate_cost
+from utils.results import ProviderResult
 
 
 def detect_language_sarvam(audio_file_path: str):
@@ -15,6 +18,10 @@ def detect_language_sarvam(audio_file_path: str):
         if not api_key:
             raise ValueError("SARVAM_API_KEY environment variable not set")
 
+        # Measure before the (billed) API call so a probe failure can't turn
+        # a successful detection into an error
+        audio_duration_minutes = get_audio_duration_seconds(audio_file_path) / 60
+
         # Sarvam AI API endpoint for language detection
         url = "https://api.sarvam.ai/speech-to-text"
 
@@ -59,28 +66,25 @@ def detect_language_sarvam(audio_file_path: str):
 
         elapsed = time.time() - start_time
 
-        # Rough estimate: $0.02 per minute of audio
-        estimated_duration_minutes = 1  # Assume 1 minute for estimation
-        estimated_cost = estimated_duration_minutes * 0.02
+        # Sarvam bills per minute of submitted audio
+        estimated_cost = calculate_cost(
+            "sarvam", {"audio_duration_minutes": audio_duration_minutes}
+        )
 
-        return {
-            "provider": "Sarvam AI",
-            "language": detected_lang,
-            "time_seconds": round(elapsed, 2),
-            "estimated_cost": round(estimated_cost, 4),
-            "tokens_used": {"audio_duration_minutes": estimated_duration_minutes},
-            "status": "success",
-            "error_message": None,
-        }
+        return ProviderResult(
+            provider="Sarvam AI",
+            language=detected_lang,
+            time_seconds=round(elapsed, 2),
+            estimated_cost=round(estimated_cost, 6),
+            tokens_used={"audio_duration_minutes": round(audio_duration_minutes, 2)},
+            status="success",
+        )
 
     except Exception as e:
         elapsed = time.time() - start_time
-        return {
-            "provider": "Sarvam AI",
-            "language": None,
-            "time_seconds": round(elapsed, 2),
-            "estimated_cost": 0,
-            "tokens_used": {"audio_duration_minutes": 0},
-            "status": "error",
-            "error_message": str(e),
-        }
+        return ProviderResult.error(
+            "Sarvam AI",
+            elapsed,
+            str(e),
+            tokens_used={"audio_duration_minutes": 0},
+        )
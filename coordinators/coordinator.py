@@ -7,64 +7,188 @@ from utils.timing import (
     get_fastest_provider,
     get_cheapest_provider,
 )
+from utils.audio import get_audio_duration_seconds
+from utils.config import BUDGET_MODE
+from utils.costs import (
+    BudgetExceededError,
+    estimate_cost,
+    get_billable_cost,
+    get_pricing_version,
+    get_tenant_budget,
+    is_billable,
+)
+from utils.shared_state import get_budget_spent, reserve_budget, adjust_budget
+from utils.hedging import call_with_hedge
+from utils.results import ProviderResult, DetectionSummary, summary_entry
 import time
 
+# All providers, in execution order
+PROVIDERS = {
+    "openai": detect_language_openai,
+    "gemini": detect_language_gemini,
+    "sarvam": detect_language_sarvam,
+    "elevenlabs": detect_language_elevenlabs,
+}
+
+# Remote providers with heavy latency tails; calls to these are hedged
+HEDGED_PROVIDERS = {"gemini", "sarvam"}
+
+
+def plan_providers_for_budget(audio_file_path: str, tenant_id: str):
+    """
+    Decide which providers fit within the tenant's remaining daily budget
+    and reserve their estimated cost.
+
+    In "downgrade" mode free (local) providers always run, so a tenant with
+    no budget left gets local-only results instead of an error.
+
+    Returns:
+        tuple: (provider keys to run, amount reserved)
+
+    Raises:
+        BudgetExceededError: In "fail" mode, if all providers don't fit
+    """
+    budget = get_tenant_budget(tenant_id)
+    if budget <= 0:
+        return list(PROVIDERS), 0.0
+
+    duration = get_audio_duration_seconds(audio_file_path)
+    estimates = {
+        key: estimate_cost(key, duration) if is_billable(key) else 0.0
+        for key in PROVIDERS
+    }
+    # Spend can overshoot the budget once reservations are reconciled
+    remaining = max(budget - get_budget_spent(tenant_id), 0.0)
+
+    if BUDGET_MODE == "downgrade":
+        # Keep free providers and the cheapest billable ones that still fit
+        selected = []
+        planned = 0.0
+        for key in sorted(PROVIDERS, key=lambda k: estimates[k]):
+            if estimates[key] == 0 or planned + estimates[key] <= remaining:
+                selected.append(key)
+                planned += estimates[key]
+        selected = [key for key in PROVIDERS if key in selected]
+    else:
+        selected = list(PROVIDERS)
+        planned = sum(estimates.values())
+
+    if planned > remaining:
+        raise BudgetExceededError(
+            f"Daily budget of ${budget:.4f} for tenant '{tenant_id}' would be exceeded "
+            f"(remaining ${remaining:.4f}, estimated ${planned:.4f})"
+        )
+
+    if planned == 0:
+        # Only free (local) providers selected; nothing to reserve
+        return selected, 0.0
+
+    # Reservation is atomic across workers; a concurrent request may have
+    # consumed the remaining budget since it was read above
+    if not reserve_budget(tenant_id, planned, budget):
+        raise BudgetExceededError(
+            f"Daily budget of ${budget:.4f} for tenant '{tenant_id}' would be exceeded"
+        )
+
+    return selected, planned
+
+
+def bill_hedge_loser(provider_key: str, result: ProviderResult, tenant_id: str):
+    """
+    Charge a losing hedge attempt to the tenant. It ran to completion (and
+    was paid for) even though its result was discarded.
+    """
+    if tenant_id is not None and result.status == "success":
+        adjust_budget(tenant_id, get_billable_cost(provider_key, result))
+
 
-def run_all_providers(audio_file_path: str):
+def run_all_providers(audio_file_path: str, tenant_id: str = None):
     """
     Orchestrates language detection across all providers.
 
     Args:
         audio_file_path (str): Path to the audio file to analyze
+        tenant_id (str): Tenant whose daily budget is charged; None disables budgeting
 
     Returns:
-        list: Results from all providers with timing and cost information
+        list: ProviderResult per provider, followed by the SUMMARY entry
+
+    Raises:
+        BudgetExceededError: If the request does not fit the tenant's budget
     """
     results = []
     start_time = time.time()
 
-    # List of all provider functions
-    providers = [
-        detect_language_openai,
-        detect_language_gemini,
-        detect_language_sarvam,
-        detect_language_elevenlabs,
-    ]
+    if tenant_id is not None:
+        selected, reserved = plan_providers_for_budget(audio_file_path, tenant_id)
+    else:
+        selected, reserved = list(PROVIDERS), 0.0
 
     # Execute each provider
-    for provider_func in providers:
+    billed = 0.0
+    hedging = {}
+    for provider_key, provider_func in PROVIDERS.items():
+        if provider_key not in selected:
+            results.append(
+                ProviderResult.error(
+                    provider_func.__name__.replace("detect_language_", "").title(),
+                    0,
+                    "Skipped to stay within the daily budget",
+                    status="skipped_budget",
+                )
+            )
+            continue
+
         try:
-            result = provider_func(audio_file_path)
+            if provider_key in HEDGED_PROVIDERS:
+                result, fired, won = call_with_hedge(
+                    provider_key,
+                    provider_func,
+                    audio_file_path,
+                    on_loser=lambda loser, key=provider_key: bill_hedge_loser(
+                        key, loser, tenant_id
+                    ),
+                )
+                hedging[provider_key] = {
+                    "hedges_fired": int(fired),
+                    "hedges_won": int(won),
+                }
+            else:
+                result = provider_func(audio_file_path)
+            # Bill before appending so a bookkeeping error can't add a
+            # second entry for a provider that already succeeded
+            if result.status == "success":
+                billed += get_billable_cost(provider_key, result)
             results.append(result)
         except Exception as e:
             # Fallback error result if provider function fails completely
             results.append(
-                {
-                    "provider": provider_func.__name__.replace(
-                        "detect_language_", ""
-                    ).title(),
-                    "language": None,
-                    "time_seconds": 0,
-                    "estimated_cost": 0,
-                    "tokens_used": {},
-                    "status": "critical_error",
-                    "error_message": f"Provider function failed: {str(e)}",
-                }
+                ProviderResult.error(
+                    provider_func.__name__.replace("detect_language_", "").title(),
+                    0,
+                    f"Provider function failed: {str(e)}",
+                    status="critical_error",
+                )
             )
 
-    total_time = time.time() - start_time
+    if tenant_id is not None:
+        # Replace the reservation with what was actually spent
+        adjust_budget(tenant_id, billed - reserved)
 
-    summary = {
-        "total_execution_time": round(total_time, 2),
-        "metrics": calculate_cost_metrics(results),
-        "fastest_provider": get_fastest_provider(results),
-        "cheapest_provider": get_cheapest_provider(results),
-    }
+    total_time = time.time() - start_time
 
-    results.append(
-        {"provider": "SUMMARY", "summary_metrics": summary, "status": "info"}
+    summary = DetectionSummary(
+        total_execution_time=round(total_time, 2),
+        pricing_version=get_pricing_version(),
+        billed_cost=round(billed, 6),
+        hedging=hedging,
+        metrics=calculate_cost_metrics(results),
+        fastest_provider=get_fastest_provider(results),
+        cheapest_provider=get_cheapest_provider(results),
     )
 
+    results.append(summary_entry(summary))
+
     return results
 
 
@@ -77,24 +201,12 @@ def run_single_provider(provider_name: str, audio_file_path: str):
         audio_file_path (str): Path to the audio file
 
     Returns:
-        dict: Result from the specified provider
+        ProviderResult: Result from the specified provider
     """
-    provider_map = {
-        "openai": detect_language_openai,
-        "gemini": detect_language_gemini,
-        "sarvam": detect_language_sarvam,
-        "elevenlabs": detect_language_elevenlabs,
-    }
-
-    provider_func = provider_map.get(provider_name.lower())
+    provider_func = PROVIDERS.get(provider_name.lower())
     if not provider_func:
-        return {
-            "provider": provider_name,
-            "language": None,
-            "time_seconds": 0,
-            "estimated_cost": 0,
-            "status": "error",
-            "error_message": f"Unknown provider: {provider_name}",
-        }
+        return ProviderResult.error(
+            provider_name, 0, f"Unknown provider: {provider_name}"
+        )
 
     return provider_func(audio_file_path)
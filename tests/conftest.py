@@ -0,0 +1,12 @@
+import pytest
+
+from utils import shared_state
+
+
+@pytest.fixture
+def shared_db(tmp_path, monkeypatch):
+    """Point shared state at a fresh SQLite file for the test."""
+    shared_state.close_shared_state()
+    monkeypatch.setattr(shared_state, "SHARED_STATE_DB", str(tmp_path / "state.db"))
+    yield shared_state
+    shared_state.close_shared_state()
@@ -0,0 +1,56 @@
+import pytest
+from fastapi.testclient import TestClient
+
+from api import main
+from coordinators import coordinator
+from utils.results import ProviderResult
+
+
+def _stub(name):
+    def detect(audio_file_path):
+        return ProviderResult(name, "en", 0.1, 0.0, "success")
+
+    return detect
+
+
+@pytest.fixture
+def client_factory(shared_db, monkeypatch):
+    db_path = shared_db.SHARED_STATE_DB
+    monkeypatch.setattr(main, "init_shared_state", lambda: shared_db.init_shared_state(db_path))
+    monkeypatch.setattr(
+        coordinator,
+        "PROVIDERS",
+        {key: _stub(key) for key in ["openai", "gemini", "sarvam", "elevenlabs"]},
+    )
+    return lambda: TestClient(main.app)
+
+
+def test_lifespan_can_run_twice(client_factory, tmp_path):
+    # Each lifespan shuts the provider pool down; the next must get a new one
+    for round_number in range(2):
+        audio = tmp_path / f"audio{round_number}.mp3"
+        audio.write_bytes(b"")
+        with client_factory() as client:
+            response = client.post(
+                "/detect/language",
+                json={"audio_file_path": str(audio), "ground_truth_language": "en"},
+            )
+        assert response.status_code == 200
+        statuses = [r["status"] for r in response.json()["results"][:-1]]
+        assert statuses == ["success"] * 4
+
+
+def test_cache_hit_is_flagged_and_not_billed(client_factory, tmp_path):
+    audio = tmp_path / "audio.mp3"
+    audio.write_bytes(b"")
+    payload = {"audio_file_path": str(audio), "ground_truth_language": "en"}
+
+    with client_factory() as client:
+        first = client.post("/detect/language", json=payload).json()
+        second = client.post("/detect/language", json=payload).json()
+
+    assert first["cached"] is False
+    assert second["cached"] is True
+    summary = second["results"][-1]["summary_metrics"]
+    assert summary["billed_cost"] == 0.0
+    assert summary["hedging"] == {}
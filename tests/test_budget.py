@@ -0,0 +1,55 @@
+import pytest
+
+from coordinators import coordinator
+from utils.costs import BudgetExceededError
+
+
+def test_reserve_budget_respects_limit(shared_db):
+    assert shared_db.reserve_budget("acme", 0.6, limit=1.0)
+    assert not shared_db.reserve_budget("acme", 0.5, limit=1.0)
+    assert shared_db.get_budget_spent("acme") == pytest.approx(0.6)
+    # Tenants are tracked separately
+    assert shared_db.reserve_budget("other", 0.9, limit=1.0)
+
+
+def test_adjust_budget_reconciles_and_never_goes_negative(shared_db):
+    shared_db.reserve_budget("acme", 0.5, limit=1.0)
+    shared_db.adjust_budget("acme", -0.2)
+    assert shared_db.get_budget_spent("acme") == pytest.approx(0.3)
+
+    shared_db.adjust_budget("acme", -1.0)
+    assert shared_db.get_budget_spent("acme") == 0.0
+
+    shared_db.adjust_budget("new", 0.25)
+    assert shared_db.get_budget_spent("new") == pytest.approx(0.25)
+
+
+@pytest.fixture
+def budget_plan(shared_db, monkeypatch):
+    """Plan providers for a 60 s file against a $0.02 daily budget."""
+    monkeypatch.setattr(coordinator, "get_audio_duration_seconds", lambda path: 60.0)
+    monkeypatch.setattr(coordinator, "get_tenant_budget", lambda tenant: 0.02)
+
+    def plan(mode):
+        monkeypatch.setattr(coordinator, "BUDGET_MODE", mode)
+        return coordinator.plan_providers_for_budget("audio.mp3", "acme")
+
+    return plan
+
+
+def test_fail_mode_rejects_over_budget(budget_plan, shared_db):
+    # gemini + sarvam for one minute exceeds $0.02
+    with pytest.raises(BudgetExceededError):
+        budget_plan("fail")
+    assert shared_db.get_budget_spent("acme") == 0.0
+
+
+def test_downgrade_mode_keeps_cheapest_and_reserves(budget_plan, shared_db):
+    selected, reserved = budget_plan("downgrade")
+    assert selected == ["openai", "gemini", "elevenlabs"]
+    assert shared_db.get_budget_spent("acme") == pytest.approx(reserved)
+
+
+def test_downgrade_mode_falls_back_to_free_providers(budget_plan, shared_db):
+    shared_db.adjust_budget("acme", 0.05)
+    assert budget_plan("downgrade") == (["openai", "elevenlabs"], 0.0)
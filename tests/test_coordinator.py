@@ -0,0 +1,70 @@
+import pytest
+
+from coordinators import coordinator
+from utils.results import ProviderResult
+
+
+def _stub(name, cost, status="success"):
+    def detect(audio_file_path):
+        return ProviderResult(name, "en", 0.1, cost, status)
+
+    return detect
+
+
+@pytest.fixture
+def stub_providers(shared_db, monkeypatch):
+    monkeypatch.setattr(
+        coordinator,
+        "PROVIDERS",
+        {
+            "openai": _stub("Whisper", 0.006),
+            "gemini": _stub("Gemini", 0.002),
+            "sarvam": _stub("Sarvam", 0.02),
+            "elevenlabs": _stub("ElevenLabs", 0.0, status="error"),
+        },
+    )
+    monkeypatch.setattr(coordinator, "get_audio_duration_seconds", lambda path: 60.0)
+    monkeypatch.setattr(coordinator, "get_tenant_budget", lambda tenant: 1.0)
+    return shared_db
+
+
+def test_run_all_providers_bills_tenant_for_actual_cost(stub_providers):
+    results = coordinator.run_all_providers("audio.mp3", tenant_id="acme")
+
+    provider_results, summary_entry = results[:-1], results[-1]
+    assert [r.provider for r in provider_results] == [
+        "Whisper",
+        "Gemini",
+        "Sarvam",
+        "ElevenLabs",
+    ]
+    assert [r.status for r in provider_results] == [
+        "success",
+        "success",
+        "success",
+        "error",
+    ]
+
+    summary = summary_entry["summary_metrics"]
+    # Local Whisper isn't billable; the failed provider costs nothing
+    assert summary.billed_cost == pytest.approx(0.022)
+    assert summary.metrics["successful_providers"] == 3
+    assert summary.metrics["failed_providers"] == 1
+    # The reservation is replaced by what was actually billed
+    assert stub_providers.get_budget_spent("acme") == pytest.approx(0.022)
+
+
+def test_run_all_providers_without_tenant_skips_budgeting(stub_providers):
+    coordinator.run_all_providers("audio.mp3")
+    assert stub_providers.get_budget_spent("acme") == 0.0
+
+
+def test_losing_hedge_attempt_is_billed(shared_db):
+    loser = ProviderResult("Sarvam", "hi", 0.1, 0.02, "success")
+    coordinator.bill_hedge_loser("sarvam", loser, "acme")
+    assert shared_db.get_budget_spent("acme") == pytest.approx(0.02)
+
+    # Local providers and failed attempts cost the tenant nothing
+    coordinator.bill_hedge_loser("openai", loser, "acme")
+    coordinator.bill_hedge_loser("sarvam", ProviderResult.error("Sarvam", 0, "x"), "acme")
+    assert shared_db.get_budget_spent("acme") == pytest.approx(0.02)
@@ -0,0 +1,109 @@
+import threading
+import time
+
+import pytest
+
+from utils import hedging
+from utils.results import ProviderResult
+
+
+@pytest.fixture(autouse=True)
+def fresh_state(monkeypatch):
+    monkeypatch.setattr(hedging, "_latencies", {})
+    monkeypatch.setattr(hedging, "_hedge_history", {})
+    monkeypatch.setattr(hedging, "HEDGE_ENABLED", True)
+    monkeypatch.setattr(hedging, "HEDGE_MIN_SAMPLES", 5)
+    monkeypatch.setattr(hedging, "HEDGE_MAX_RATE", 0.5)
+
+
+def _seed(provider_key, seconds, count):
+    for _ in range(count):
+        hedging.record_latency(provider_key, seconds)
+
+
+def test_hedge_delay_needs_min_samples():
+    _seed("p", 0.1, 4)
+    assert hedging.get_hedge_delay("p") is None
+    _seed("p", 0.1, 1)
+    assert hedging.get_hedge_delay("p") == 0.1
+
+
+def test_hedge_delay_is_p95():
+    for i in range(1, 101):
+        hedging.record_latency("p", i / 100)
+    assert hedging.get_hedge_delay("p") == pytest.approx(0.95)
+
+
+def test_hedge_rate_cap():
+    assert hedging._hedge_allowed("p")
+    for hedged in [True, False, False]:
+        hedging._record_call("p", hedged)
+    # 2 of 4 calls hedged is exactly the 0.5 cap
+    assert hedging._hedge_allowed("p")
+    hedging._record_call("p", True)
+    # 3 of 5 would exceed it
+    assert not hedging._hedge_allowed("p")
+
+
+def test_fast_call_does_not_hedge():
+    _seed("p", 0.5, 5)
+    result, fired, won = hedging.call_with_hedge(
+        "p", lambda: ProviderResult("P", "en", 0.0, 0.0, "success")
+    )
+    assert (result.language, fired, won) == ("en", False, False)
+
+
+def test_slow_primary_is_hedged_and_loser_reported():
+    _seed("p", 0.02, 5)
+    calls = []
+    release_primary = threading.Event()
+
+    def provider():
+        calls.append(None)
+        if len(calls) == 1:
+            release_primary.wait(2)
+            return ProviderResult("P", "slow", 0.0, 0.01, "success")
+        return ProviderResult("P", "fast", 0.0, 0.01, "success")
+
+    losers = []
+    result, fired, won = hedging.call_with_hedge("p", provider, on_loser=losers.append)
+    assert (result.language, fired, won) == ("fast", True, True)
+
+    release_primary.set()
+    deadline = time.time() + 2
+    while not losers and time.time() < deadline:
+        time.sleep(0.01)
+    # The losing primary is reported and its latency still recorded
+    assert [r.language for r in losers] == ["slow"]
+    assert max(hedging._latencies["p"]) > 0.02
+
+
+def test_failed_hedge_does_not_beat_successful_primary():
+    _seed("p", 0.02, 5)
+    calls = []
+
+    def provider():
+        calls.append(None)
+        if len(calls) == 1:
+            time.sleep(0.2)
+            return ProviderResult("P", "en", 0.0, 0.01, "success")
+        return ProviderResult.error("P", 0.0, "boom")
+
+    result, fired, won = hedging.call_with_hedge("p", provider)
+    assert (result.status, fired, won) == ("success", True, False)
+
+
+def test_failed_attempts_do_not_feed_p95():
+    hedging.call_with_hedge("p", lambda: ProviderResult.error("P", 0.0, "no key"))
+    assert "p" not in hedging._latencies
+
+    hedging.call_with_hedge("p", lambda: ProviderResult("P", "en", 0.0, 0.0, "success"))
+    assert len(hedging._latencies["p"]) == 1
+
+
+def test_pool_is_recreated_after_shutdown():
+    hedging.shutdown_hedging()
+    result, _, _ = hedging.call_with_hedge(
+        "p", lambda: ProviderResult("P", "en", 0.0, 0.0, "success")
+    )
+    assert result.status == "success"
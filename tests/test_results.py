@@ -0,0 +1,17 @@
+import orjson
+
+from utils.results import ProviderResult, SegmentResult
+
+
+def test_provider_result_serializes_without_segment_fields():
+    data = orjson.loads(orjson.dumps(ProviderResult("P", "en", 0.1, 0.0, "success")))
+    assert "segments" not in data
+    assert "language_share" not in data
+    assert data["confidence"] is None
+
+
+def test_segment_result_error_has_empty_timeline():
+    result = SegmentResult.error("P", 0.2, "boom")
+    assert isinstance(result, SegmentResult)
+    data = orjson.loads(orjson.dumps(result))
+    assert (data["status"], data["segments"], data["language_share"]) == ("error", [], {})
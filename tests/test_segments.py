@@ -0,0 +1,60 @@
+import pytest
+
+from connectors.openai_connector import _add_window, _summarize_segments
+
+
+def test_adjacent_windows_with_same_language_merge():
+    segments = []
+    end = _add_window(segments, 0.0, 30.0, {"hi": 0.9, "en": 0.1})
+    end = _add_window(segments, end, 10.0, {"hi": 0.5, "en": 0.4})
+    end = _add_window(segments, end, 30.0, {"en": 0.8, "pa": 0.2})
+
+    assert end == 70.0
+    assert [(s["start"], s["end"], s["language"]) for s in segments] == [
+        (0.0, 40.0, "hi"),
+        (40.0, 70.0, "en"),
+    ]
+    # Duration-weighted: (0.9 * 30 + 0.5 * 10) / 40
+    assert segments[0]["confidence"] == pytest.approx(0.8)
+
+
+def test_language_returning_after_switch_starts_new_segment():
+    segments = []
+    end = 0.0
+    for lang in ["pa", "en", "pa"]:
+        end = _add_window(segments, end, 30.0, {lang: 0.7})
+    assert [s["language"] for s in segments] == ["pa", "en", "pa"]
+
+
+def test_summary_share_and_confidence():
+    segments = []
+    end = _add_window(segments, 0.0, 30.0, {"pa": 0.6})
+    end = _add_window(segments, end, 30.0, {"en": 0.9})
+    end = _add_window(segments, end, 30.0, {"pa": 0.8})
+
+    share, dominant, confidence = _summarize_segments(segments)
+    assert dominant == "pa"
+    assert share == {"pa": 0.667, "en": 0.333}
+    # Detection probability, not time share
+    assert confidence == pytest.approx(0.7)
+
+
+def test_short_trailing_window_folds_into_previous_segment():
+    segments = []
+    end = _add_window(segments, 0.0, 30.0, {"hi": 0.9, "en": 0.1})
+    end = _add_window(segments, end, 0.4, {"en": 0.6, "hi": 0.4})
+
+    assert end == pytest.approx(30.4)
+    assert len(segments) == 1
+    assert segments[0]["language"] == "hi"
+    assert segments[0]["end"] == pytest.approx(30.4)
+    assert segments[0]["confidence"] == pytest.approx(0.9)
+
+    share, dominant, _ = _summarize_segments(segments)
+    assert (dominant, share) == ("hi", {"hi": 1.0})
+
+
+def test_short_only_window_is_still_classified():
+    segments = []
+    _add_window(segments, 0.0, 0.5, {"en": 0.7, "hi": 0.3})
+    assert [s["language"] for s in segments] == ["en"]
@@ -0,0 +1,23 @@
+from utils.results import ProviderResult
+
+
+def test_accessors_open_connection_lazily(shared_db):
+    # No init_shared_state() call: must open the database, not deadlock
+    assert shared_db.check_rate_limit("client", limit_per_minute=5)
+    shared_db.close_shared_state()
+    assert shared_db.get_cached_result("missing") is None
+
+
+def test_rate_limit_window(shared_db):
+    allowed = [shared_db.check_rate_limit("client", limit_per_minute=3) for _ in range(5)]
+    assert allowed == [True, True, True, False, False]
+    assert shared_db.check_rate_limit("other", limit_per_minute=3)
+
+
+def test_cache_round_trip_and_expiry(shared_db):
+    result = ProviderResult("Test", "en", 0.1, 0.001, "success")
+    shared_db.set_cached_result("key", [result])
+    assert shared_db.get_cached_result("key")[0]["language"] == "en"
+
+    shared_db.set_cached_result("expired", [result], ttl_seconds=-1)
+    assert shared_db.get_cached_result("expired") is None
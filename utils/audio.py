@@ -0,0 +1,33 @@
+import subprocess
+from functools import lru_cache
+from pathlib import Path
+
+
+@lru_cache(maxsize=256)
+def _probe_duration(path: str, mtime_ns: int, size: int) -> float:
+    output = subprocess.run(
+        [
+            "ffprobe",
+            "-v",
+            "error",
+            "-show_entries",
+            "format=duration",
+            "-of",
+            "default=noprint_wrappers=1:nokey=1",
+            path,
+        ],
+        capture_output=True,
+        text=True,
+        check=True,
+    ).stdout
+    return float(output.strip())
+
+
+def get_audio_duration_seconds(audio_file_path: str) -> float:
+    """
+    Measure audio duration with ffprobe. Results are cached per file
+    version, so the coordinator and each connector can call this freely.
+    """
+    path = Path(audio_file_path).resolve()
+    stat = path.stat()
+    return _probe_duration(str(path), stat.st_mtime_ns, stat.st_size)
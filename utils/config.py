@@ -0,0 +1,97 @@
+import json
+import os
+from dotenv import load_dotenv
+
+load_dotenv()
+
+
+def _get_int(name: str, default: int) -> int:
+    """Read an integer environment variable, falling back to default."""
+    value = os.getenv(name)
+    if value is None or value.strip() == "":
+        return default
+    try:
+        return int(value)
+    except ValueError:
+        return default
+
+
+def _get_float(name: str, default: float) -> float:
+    """Read a float environment variable, falling back to default."""
+    value = os.getenv(name)
+    if value is None or value.strip() == "":
+        return default
+    try:
+        return float(value)
+    except ValueError:
+        return default
+
+
+def _get_json(name: str, default):
+    """Read a JSON environment variable, falling back to default."""
+    value = os.getenv(name)
+    if value is None or value.strip() == "":
+        return default
+    try:
+        return json.loads(value)
+    except ValueError:
+        return default
+
+
+# Server / deployment
+HOST = os.getenv("HOST", "0.0.0.0")
+PORT = _get_int("PORT", 8000)
+WORKERS = max(1, _get_int("WORKERS", 1))
+PRELOAD_WHISPER = os.getenv("PRELOAD_WHISPER", "false").lower() == "true"
+
+# Cross-process shared state (result cache + rate limiting)
+SHARED_STATE_DB = os.getenv("SHARED_STATE_DB", ".shared_state.sqlite3")
+CACHE_TTL_SECONDS = _get_int("CACHE_TTL_SECONDS", 3600)
+RATE_LIMIT_PER_MINUTE = _get_int("RATE_LIMIT_PER_MINUTE", 60)
+
+# Provider pricing (USD). Bump PRICING_VERSION whenever rates change so
+# reported costs can be traced back to the table that produced them.
+# "billable" is False for providers that run locally or are mocked; their
+# cost is an equivalent API price for comparison and is not charged against budgets.
+PRICING_VERSION = "2025-08-01"
+PRICING = {
+    "openai": {"per_audio_minute": 0.006, "billable": False},
+    "gemini": {
+        # gemini-2.5-flash: audio input / text output per 1M tokens
+        "input_per_million_tokens": 1.00,
+        "output_per_million_tokens": 2.50,
+        "audio_tokens_per_second": 32,
+        "billable": True,
+    },
+    "sarvam": {"per_audio_minute": 0.02, "billable": True},
+    # Mock connector; set billable once it makes real API calls
+    "elevenlabs": {"per_audio_minute": 0.0067, "billable": False},
+}
+
+# Optional JSON file ({"version": ..., "providers": {...}}) replacing the table above
+PRICING_FILE = os.getenv("PRICING_FILE")
+if PRICING_FILE:
+    with open(PRICING_FILE) as pricing_file:
+        _pricing = json.load(pricing_file)
+    PRICING_VERSION = _pricing.get("version", PRICING_VERSION)
+    PRICING = _pricing.get("providers", PRICING)
+
+# Budgets: USD per tenant per UTC day (0 = unlimited)
+DAILY_BUDGET_USD = _get_float("DAILY_BUDGET_USD", 0.0)
+# Per-tenant overrides as JSON, e.g. {"acme": 5.0}
+TENANT_BUDGETS = _get_json("TENANT_BUDGETS", {})
+# "fail": reject requests that would exceed the budget
+# "downgrade": run only the cheapest providers that still fit
+BUDGET_MODE = os.getenv("BUDGET_MODE", "fail").lower()
+
+# Hedged requests for remote providers: if a call is slower than the
+# provider's rolling p95 latency, a second attempt is started.
+HEDGE_ENABLED = os.getenv("HEDGE_ENABLED", "true").lower() == "true"
+# Maximum fraction of calls per provider that may be hedged (bounds cost)
+HEDGE_MAX_RATE = _get_float("HEDGE_MAX_RATE", 0.1)
+# Latency samples kept per provider, and needed before hedging starts
+HEDGE_WINDOW_SIZE = _get_int("HEDGE_WINDOW_SIZE", 200)
+HEDGE_MIN_SAMPLES = _get_int("HEDGE_MIN_SAMPLES", 20)
+# Threads for provider calls per worker. FastAPI runs up to 40 sync
+# requests at once and each can have a primary and a hedge in flight.
+HEDGE_POOL_SIZE = max(1, _get_int("HEDGE_POOL_SIZE", 80))
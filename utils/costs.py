@@ -0,0 +1,73 @@
+from typing import Dict, Any
+
+from utils.config import (
+    PRICING,
+    PRICING_VERSION,
+    DAILY_BUDGET_USD,
+    TENANT_BUDGETS,
+)
+from utils.results import ProviderResult
+
+
+class BudgetExceededError(Exception):
+    """Raised when a request would push a tenant over its daily budget."""
+
+
+def calculate_cost(provider_key: str, usage: Dict[str, Any]) -> float:
+    """
+    Price actual usage with the current pricing table.
+
+    Args:
+        provider_key (str): 'openai', 'gemini', 'sarvam' or 'elevenlabs'
+        usage (dict): Either input/output token counts or audio_duration_minutes
+
+    Returns:
+        float: Cost in USD
+    """
+    pricing = PRICING[provider_key]
+    if "per_audio_minute" in pricing:
+        return usage.get("audio_duration_minutes", 0) * pricing["per_audio_minute"]
+
+    return (
+        usage.get("input", 0) * pricing["input_per_million_tokens"]
+        + usage.get("output", 0) * pricing["output_per_million_tokens"]
+    ) / 1000000
+
+
+def estimate_cost(provider_key: str, audio_duration_seconds: float) -> float:
+    """
+    Estimate the cost of a call before it is made, from the audio duration.
+    """
+    pricing = PRICING[provider_key]
+    if "per_audio_minute" in pricing:
+        usage = {"audio_duration_minutes": audio_duration_seconds / 60}
+    else:
+        usage = {
+            "input": audio_duration_seconds * pricing["audio_tokens_per_second"],
+            # A language code plus a little slack
+            "output": 10,
+        }
+    return calculate_cost(provider_key, usage)
+
+
+def is_billable(provider_key: str) -> bool:
+    """Whether the provider's cost counts against tenant budgets."""
+    return PRICING[provider_key].get("billable", True)
+
+
+def get_billable_cost(provider_key: str, result: ProviderResult) -> float:
+    """Cost of a provider result that is actually charged to the tenant."""
+    if not is_billable(provider_key):
+        return 0.0
+    return result.estimated_cost
+
+
+def get_tenant_budget(tenant_id: str) -> float:
+    """
+    Daily budget in USD for a tenant; 0 means unlimited.
+    """
+    return float(TENANT_BUDGETS.get(tenant_id, DAILY_BUDGET_USD))
+
+
+def get_pricing_version() -> str:
+    return PRICING_VERSION
@@ -0,0 +1,172 @@
+import math
+import threading
+import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
+from typing import Any, Callable, Dict, Optional, Tuple
+
+from utils.config import (
+    HEDGE_ENABLED,
+    HEDGE_MAX_RATE,
+    HEDGE_WINDOW_SIZE,
+    HEDGE_MIN_SAMPLES,
+    HEDGE_POOL_SIZE,
+)
+
+# Rolling per-provider state, local to this worker process
+_latencies: Dict[str, deque] = {}
+_hedge_history: Dict[str, deque] = {}
+_lock = threading.Lock()
+
+# Created by init_hedging() (or on first use) and dropped by
+# shutdown_hedging(), so a later lifespan in the same process gets a new pool
+_executor: Optional[ThreadPoolExecutor] = None
+_executor_lock = threading.Lock()
+
+
+def init_hedging() -> ThreadPoolExecutor:
+    """
+    Create the provider thread pool if it isn't running; call on worker startup.
+    Sized for every concurrent request to have a primary and a hedge in flight.
+    """
+    global _executor
+    with _executor_lock:
+        if _executor is None:
+            _executor = ThreadPoolExecutor(
+                max_workers=HEDGE_POOL_SIZE, thread_name_prefix="provider"
+            )
+        return _executor
+
+
+def record_latency(provider_key: str, seconds: float):
+    """Add a completed call's latency to the provider's rolling window."""
+    with _lock:
+        _latencies.setdefault(provider_key, deque(maxlen=HEDGE_WINDOW_SIZE)).append(
+            seconds
+        )
+
+
+def get_hedge_delay(provider_key: str) -> Optional[float]:
+    """
+    Return the provider's rolling p95 latency, or None until enough
+    samples have been collected.
+    """
+    with _lock:
+        samples = sorted(_latencies.get(provider_key, ()))
+    if len(samples) < HEDGE_MIN_SAMPLES:
+        return None
+    index = min(len(samples) - 1, math.ceil(0.95 * len(samples)) - 1)
+    return samples[index]
+
+
+def _hedge_allowed(provider_key: str) -> bool:
+    """Whether hedging this call keeps the provider under HEDGE_MAX_RATE."""
+    history = _hedge_history.get(provider_key)
+    if not history:
+        return HEDGE_MAX_RATE > 0
+    return (sum(history) + 1) / (len(history) + 1) <= HEDGE_MAX_RATE
+
+
+def _record_call(provider_key: str, hedged: bool):
+    _hedge_history.setdefault(provider_key, deque(maxlen=HEDGE_WINDOW_SIZE)).append(
+        hedged
+    )
+
+
+def _run_attempt(
+    provider_key: str, started: threading.Event, func: Callable, *args
+) -> Any:
+    """
+    Run one attempt and record its latency when it succeeds, including
+    attempts that lose a hedge, so the p95 isn't biased towards fast calls.
+    Failures aren't recorded: fast errors (missing key, instant 4xx) would
+    drag the p95 towards zero and fire hedges on healthy calls.
+    """
+    started.set()
+    start_time = time.time()
+    result = func(*args)
+    if getattr(result, "status", "success") == "success":
+        record_latency(provider_key, time.time() - start_time)
+    return result
+
+
+def _succeeded(future) -> bool:
+    if future.exception() is not None:
+        return False
+    return getattr(future.result(), "status", "success") == "success"
+
+
+def call_with_hedge(
+    provider_key: str,
+    func: Callable,
+    *args,
+    on_loser: Optional[Callable[[Any], None]] = None,
+) -> Tuple[Any, bool, bool]:
+    """
+    Call func, issuing a second attempt if the first has not returned by
+    the provider's p95 latency. The first successful response wins.
+
+    Threads cannot be interrupted, so the losing attempt is cancelled if it
+    has not started yet and otherwise left to finish with its result discarded.
+    on_loser is called with the losing attempt's result once it finishes,
+    e.g. to bill its cost.
+
+    Returns:
+        tuple: (result, hedge fired, hedge won)
+    """
+    delay = get_hedge_delay(provider_key) if HEDGE_ENABLED else None
+    primary_started = threading.Event()
+    executor = init_hedging()
+    primary = executor.submit(_run_attempt, provider_key, primary_started, func, *args)
+
+    if delay is None:
+        with _lock:
+            _record_call(provider_key, False)
+        return primary.result(), False, False
+
+    # Time the primary from when it starts running, not from when it was
+    # queued, so a busy pool doesn't look like a slow provider
+    while not primary_started.wait(timeout=0.1):
+        if primary.done():  # cancelled by shutdown_hedging()
+            break
+    done, _ = wait([primary], timeout=delay)
+    with _lock:
+        fire = not done and _hedge_allowed(provider_key)
+        _record_call(provider_key, fire)
+
+    if not fire:
+        return primary.result(), False, False
+
+    hedge = executor.submit(
+        _run_attempt, provider_key, threading.Event(), func, *args
+    )
+    pending = {primary, hedge}
+    winner = None
+    # Take the first success; a failure only wins if both attempts fail
+    while pending:
+        done, pending = wait(pending, return_when=FIRST_COMPLETED)
+        winner = next((f for f in done if _succeeded(f)), winner or next(iter(done)))
+        if _succeeded(winner):
+            break
+
+    for future in pending:
+        future.cancel()
+
+    loser = primary if winner is hedge else hedge
+    if on_loser is not None:
+        loser.add_done_callback(
+            lambda future: on_loser(future.result())
+            if not future.cancelled() and future.exception() is None
+            else None
+        )
+
+    return winner.result(), True, winner is hedge
+
+
+def shutdown_hedging():
+    """Drop queued attempts and wait for running ones; call on worker shutdown."""
+    global _executor
+    with _executor_lock:
+        executor, _executor = _executor, None
+    if executor is not None:
+        executor.shutdown(wait=True, cancel_futures=True)
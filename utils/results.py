@@ -0,0 +1,72 @@
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Optional
+
+
+@dataclass(slots=True)
+class ProviderResult:
+    """
+    Result of one provider's language detection. Every connector returns
+    this type so all results share the same keys when serialized.
+    """
+
+    provider: str
+    language: Optional[str]
+    time_seconds: float
+    estimated_cost: float
+    status: str
+    error_message: Optional[str] = None
+    confidence: Optional[float] = None
+    tokens_used: Dict[str, Any] = field(default_factory=dict)
+
+    @classmethod
+    def error(
+        cls,
+        provider: str,
+        elapsed: float,
+        error_message: str,
+        status: str = "error",
+        tokens_used: Optional[Dict[str, Any]] = None,
+    ) -> "ProviderResult":
+        """Build a failed result with zero cost."""
+        return cls(
+            provider=provider,
+            language=None,
+            time_seconds=round(elapsed, 2),
+            estimated_cost=0,
+            status=status,
+            error_message=error_message,
+            tokens_used=tokens_used or {},
+        )
+
+
+@dataclass(slots=True)
+class SegmentResult(ProviderResult):
+    """
+    Result of segmental detection: a timeline of
+    {start, end, language, confidence} segments and per-language time share.
+    Kept off ProviderResult so regular results don't carry always-null fields.
+    """
+
+    segments: List[Dict[str, Any]] = field(default_factory=list)
+    language_share: Dict[str, float] = field(default_factory=dict)
+
+
+@dataclass(slots=True)
+class DetectionSummary:
+    """
+    Aggregate metrics for one run across all providers. Appended to the
+    results list as the "SUMMARY" entry (see summary_entry).
+    """
+
+    total_execution_time: float
+    pricing_version: str
+    billed_cost: float
+    metrics: Dict[str, Any]
+    fastest_provider: Optional[Dict[str, Any]]
+    cheapest_provider: Optional[Dict[str, Any]]
+    hedging: Dict[str, Dict[str, int]] = field(default_factory=dict)
+
+
+def summary_entry(summary: DetectionSummary) -> Dict[str, Any]:
+    """Wrap a summary in the SUMMARY entry returned alongside provider results."""
+    return {"provider": "SUMMARY", "summary_metrics": summary, "status": "info"}
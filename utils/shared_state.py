@@ -0,0 +1,225 @@
+import sqlite3
+import threading
+import time
+from typing import Any, Optional
+
+import orjson
+
+from utils.config import SHARED_STATE_DB, CACHE_TTL_SECONDS, RATE_LIMIT_PER_MINUTE
+
+# One connection per worker process; FastAPI runs sync endpoints in a
+# threadpool, so access is serialised with a lock.
+_connection = None
+_lock = threading.Lock()
+
+
+def _open_locked(db_path: str):
+    """Open the connection and create tables. Caller must hold _lock."""
+    global _connection
+    if _connection is not None:
+        return
+    _connection = sqlite3.connect(
+        db_path, timeout=10, check_same_thread=False, isolation_level=None
+    )
+    # WAL lets readers in other workers proceed while one worker writes
+    _connection.execute("PRAGMA journal_mode=WAL")
+    _connection.execute("PRAGMA synchronous=NORMAL")
+    _connection.execute(
+        """
+        CREATE TABLE IF NOT EXISTS result_cache (
+            cache_key TEXT PRIMARY KEY,
+            value BLOB NOT NULL,
+            expires_at REAL NOT NULL
+        )
+        """
+    )
+    _connection.execute(
+        """
+        CREATE TABLE IF NOT EXISTS rate_limits (
+            client_key TEXT NOT NULL,
+            window_start INTEGER NOT NULL,
+            count INTEGER NOT NULL,
+            PRIMARY KEY (client_key, window_start)
+        )
+        """
+    )
+    _connection.execute(
+        """
+        CREATE TABLE IF NOT EXISTS budget_usage (
+            tenant_id TEXT NOT NULL,
+            day TEXT NOT NULL,
+            spent REAL NOT NULL,
+            PRIMARY KEY (tenant_id, day)
+        )
+        """
+    )
+
+
+def init_shared_state(db_path: str = SHARED_STATE_DB):
+    """
+    Open the SQLite database shared by all worker processes and create tables.
+    Safe to call from every worker on startup.
+    """
+    with _lock:
+        _open_locked(db_path)
+
+
+def close_shared_state():
+    """Close this worker's connection to the shared database."""
+    global _connection
+    with _lock:
+        if _connection is not None:
+            _connection.close()
+            _connection = None
+
+
+def _get_connection():
+    """Return the connection, opening it on first use. Caller must hold _lock."""
+    _open_locked(SHARED_STATE_DB)
+    return _connection
+
+
+def get_cached_result(cache_key: str) -> Optional[Any]:
+    """
+    Return the cached value for cache_key, or None if missing or expired.
+    """
+    with _lock:
+        row = (
+            _get_connection()
+            .execute(
+                "SELECT value, expires_at FROM result_cache WHERE cache_key = ?",
+                (cache_key,),
+            )
+            .fetchone()
+        )
+    if row is None or row[1] < time.time():
+        return None
+    return orjson.loads(row[0])
+
+
+def set_cached_result(cache_key: str, value: Any, ttl_seconds: int = CACHE_TTL_SECONDS):
+    """
+    Store a JSON-serialisable value (dataclasses included) visible to
+    every worker process.
+    """
+    if ttl_seconds <= 0:
+        return
+    with _lock:
+        _get_connection().execute(
+            "INSERT OR REPLACE INTO result_cache (cache_key, value, expires_at) VALUES (?, ?, ?)",
+            (cache_key, orjson.dumps(value), time.time() + ttl_seconds),
+        )
+
+
+def check_rate_limit(client_key: str, limit_per_minute: int = RATE_LIMIT_PER_MINUTE) -> bool:
+    """
+    Count a request against a fixed one-minute window shared by all workers.
+
+    Returns:
+        bool: True if the request is allowed, False if the limit is exceeded
+    """
+    if limit_per_minute <= 0:
+        return True
+
+    window_start = int(time.time() // 60) * 60
+    with _lock:
+        connection = _get_connection()
+        # BEGIN IMMEDIATE takes the write lock so increment + read is atomic
+        # across processes
+        connection.execute("BEGIN IMMEDIATE")
+        try:
+            connection.execute(
+                """
+                INSERT INTO rate_limits (client_key, window_start, count) VALUES (?, ?, 1)
+                ON CONFLICT (client_key, window_start) DO UPDATE SET count = count + 1
+                """,
+                (client_key, window_start),
+            )
+            count = connection.execute(
+                "SELECT count FROM rate_limits WHERE client_key = ? AND window_start = ?",
+                (client_key, window_start),
+            ).fetchone()[0]
+            connection.execute(
+                "DELETE FROM rate_limits WHERE window_start < ?", (window_start,)
+            )
+            connection.execute("COMMIT")
+        except Exception:
+            connection.execute("ROLLBACK")
+            raise
+
+    return count <= limit_per_minute
+
+
+def purge_expired_results():
+    """Drop expired cache entries."""
+    with _lock:
+        _get_connection().execute(
+            "DELETE FROM result_cache WHERE expires_at < ?", (time.time(),)
+        )
+
+
+def _budget_day() -> str:
+    return time.strftime("%Y-%m-%d", time.gmtime())
+
+
+def get_budget_spent(tenant_id: str) -> float:
+    """Return the amount a tenant has spent today (UTC), across all workers."""
+    with _lock:
+        row = (
+            _get_connection()
+            .execute(
+                "SELECT spent FROM budget_usage WHERE tenant_id = ? AND day = ?",
+                (tenant_id, _budget_day()),
+            )
+            .fetchone()
+        )
+    return row[0] if row else 0.0
+
+
+def reserve_budget(tenant_id: str, amount: float, limit: float) -> bool:
+    """
+    Atomically add amount to today's spend if it stays within limit.
+
+    Returns:
+        bool: True if the amount was reserved, False if it would exceed limit
+    """
+    day = _budget_day()
+    with _lock:
+        connection = _get_connection()
+        connection.execute("BEGIN IMMEDIATE")
+        try:
+            row = connection.execute(
+                "SELECT spent FROM budget_usage WHERE tenant_id = ? AND day = ?",
+                (tenant_id, day),
+            ).fetchone()
+            spent = row[0] if row else 0.0
+            if spent + amount > limit:
+                connection.execute("ROLLBACK")
+                return False
+            connection.execute(
+                """
+                INSERT INTO budget_usage (tenant_id, day, spent) VALUES (?, ?, ?)
+                ON CONFLICT (tenant_id, day) DO UPDATE SET spent = spent + excluded.spent
+                """,
+                (tenant_id, day, amount),
+            )
+            connection.execute("COMMIT")
+        except Exception:
+            connection.execute("ROLLBACK")
+            raise
+    return True
+
+
+def adjust_budget(tenant_id: str, delta: float):
+    """
+    Add delta (may be negative) to today's spend, e.g. to replace a
+    reservation with the actual cost once it is known.
+    """
+    with _lock:
+        _get_connection().execute(
+            """
+            INSERT INTO budget_usage (tenant_id, day, spent) VALUES (?, ?, MAX(?, 0))
+            ON CONFLICT (tenant_id, day) DO UPDATE SET spent = MAX(spent + ?, 0)
+            """,
+            (tenant_id, _budget_day(), delta, delta),
+        )
@@ -1,6 +1,8 @@
 import time
 from functools import wraps
-from typing import Dict, Any, Callable
+from typing import Dict, Any, Callable, List, Optional
+
+from utils.results import ProviderResult
 
 
 def measure_execution_time(func: Callable) -> Callable:
@@ -14,77 +16,81 @@ def measure_execution_time(func: Callable) -> Callable:
         result = func(*args, **kwargs)
         execution_time = time.time() - start_time
 
-        # Add timing info to result if it's a dict
+        # Add timing info to result if it's a dict or provider result
         if isinstance(result, dict):
             result["execution_time"] = round(execution_time, 2)
+        elif isinstance(result, ProviderResult):
+            result.time_seconds = round(execution_time, 2)
 
         return result
 
     return wrapper
 
 
-def calculate_cost_metrics(results: list) -> Dict[str, Any]:
+def calculate_cost_metrics(results: List[ProviderResult]) -> Dict[str, Any]:
     """
     Calculate aggregated cost metrics from provider results.
     """
     total_cost = 0
     successful_providers = 0
     failed_providers = 0
+    skipped_providers = 0
     total_time = 0
 
     for result in results:
-        if result.get("status") == "success":
+        if result.status == "success":
             successful_providers += 1
-            total_cost += result.get("estimated_cost", 0)
+            total_cost += result.estimated_cost
+        elif result.status == "skipped_budget":
+            skipped_providers += 1
         else:
             failed_providers += 1
 
-        total_time += result.get("time_seconds", 0)
+        total_time += result.time_seconds
 
     return {
         "total_estimated_cost": round(total_cost, 6),
         "total_execution_time": round(total_time, 2),
         "successful_providers": successful_providers,
         "failed_providers": failed_providers,
+        "skipped_providers": skipped_providers,
         "success_rate": (
             round(successful_providers / len(results) * 100, 1) if results else 0
         ),
     }
 
 
-def get_fastest_provider(results: list) -> Dict[str, Any]:
+def get_fastest_provider(results: List[ProviderResult]) -> Optional[Dict[str, Any]]:
     """
     Find the fastest successful provider.
     """
-    successful_results = [r for r in results if r.get("status") == "success"]
+    successful_results = [r for r in results if r.status == "success"]
 
     if not successful_results:
         return None
 
-    fastest = min(successful_results, key=lambda x: x.get("time_seconds", float("inf")))
+    fastest = min(successful_results, key=lambda x: x.time_seconds)
 
     return {
-        "provider": fastest.get("provider"),
-        "time_seconds": fastest.get("time_seconds"),
-        "language": fastest.get("language"),
+        "provider": fastest.provider,
+        "time_seconds": fastest.time_seconds,
+        "language": fastest.language,
     }
 
 
-def get_cheapest_provider(results: list) -> Dict[str, Any]:
+def get_cheapest_provider(results: List[ProviderResult]) -> Optional[Dict[str, Any]]:
     """
     Find the cheapest successful provider.
     """
-    successful_results = [r for r in results if r.get("status") == "success"]
+    successful_results = [r for r in results if r.status == "success"]
 
     if not successful_results:
         return None
 
-    cheapest = min(
-        successful_results, key=lambda x: x.get("estimated_cost", float("inf"))
-    )
+    cheapest = min(successful_results, key=lambda x: x.estimated_cost)
 
     return {
-        "provider": cheapest.get("provider"),
-        "estimated_cost": cheapest.get("estimated_cost"),
-        "language": cheapest.get("language"),
+        "provider": cheapest.provider,
+        "estimated_cost": cheapest.estimated_cost,
+        "language": cheapest.language,
     }